@@ -0,0 +1,25 @@
+"""
+Gunicorn configuration for the Bantuan backend
+
+Run with:
+    gunicorn -c gunicorn.conf.py app:app
+"""
+
+import multiprocessing
+import os
+
+# The app is ASGI (Quart), so each worker runs an asyncio event loop (uvloop
+# when available) and keeps many chat requests in flight at once
+worker_class = 'uvicorn_worker.UvicornWorker'
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+
+# LLM calls can take several seconds; don't kill workers mid-request
+timeout = 120
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('LOG_LEVEL', 'info')
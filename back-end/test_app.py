@@ -0,0 +1,21 @@
+"""
+Tests for the Bantuan backend
+
+Run from back-end/ with:
+    python -m pytest -q
+"""
+
+import pytest
+
+tiktoken = pytest.importorskip('tiktoken')
+app = pytest.importorskip('app')
+
+
+def test_system_prompt_exceeds_prompt_cache_threshold():
+    """The static prefix alone must be long enough for Azure prompt caching"""
+    try:
+        encoding = tiktoken.encoding_for_model('gpt-3.5-turbo')
+    except Exception as e:
+        pytest.skip(f"tiktoken encoding unavailable: {e}")
+    
+    assert len(encoding.encode(app.SYSTEM_PROMPT)) > app.PROMPT_CACHE_MIN_TOKENS